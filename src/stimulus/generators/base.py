@@ -13,6 +13,7 @@ from typing import (
     IO,
     Iterable,
     List,
+    Optional,
     Sequence,
     Tuple,
 )
@@ -320,10 +321,14 @@ class BlockBasedCodeGenerator(CodeGeneratorBase):
 
     def generate(self, inputs: Sequence[str], out: IO[str]) -> None:
         for input in inputs:
+            # Collect the output for the entire input file and write it in
+            # one go instead of writing it line by line
+            chunks = []
             with open(input) as fp:
                 for line in fp:
-                    if not self._process_marker_line(line, out):
-                        out.write(line)
+                    block = self._process_marker_line(line)
+                    chunks.append(line if block is None else block)
+            out.write("".join(chunks))
 
     def _generate_block(self, name: str) -> str:
         """Generates the contents of the block with the given name.
@@ -339,14 +344,15 @@ class BlockBasedCodeGenerator(CodeGeneratorBase):
         handler(buf)
         return buf.getvalue()
 
-    def _process_marker_line(self, line: str, out: IO[str]) -> bool:
+    def _process_marker_line(self, line: str) -> Optional[str]:
         """Attempts to process a potential marker line in one of the input files.
 
         Marker lines are the ones that start with ``% STIMULUS``.
 
         Returns:
-            whether the line was handled. Unhandled files should be forwarded to
-            the output as is by the caller.
+            the contents of the block that should replace the line if the line
+            was a marker line, `None` otherwise. Unhandled lines should be
+            forwarded to the output as is by the caller.
         """
         match = self._BLOCK_REGEXP.match(line)
         if match:
@@ -354,10 +360,9 @@ class BlockBasedCodeGenerator(CodeGeneratorBase):
             block = self._block_cache.get(block_name)
             if block is None:
                 self._block_cache[block_name] = block = self._generate_block(block_name)
-            out.write(block)
-            return True
+            return block
         else:
-            return False
+            return None
 
 
 class InputPlacement(Enum):
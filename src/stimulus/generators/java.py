@@ -3,10 +3,14 @@
 TODO: - everything :) This is just a PoC implementation.
 """
 
-from typing import Any, Dict, IO
+import re
 
-from stimulus.errors import StimulusError
-from stimulus.model import ParamMode, ParamSpec
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any, Callable, Dict, IO, List, Optional, Tuple
+
+from stimulus.errors import NoSuchTypeError, StimulusError
+from stimulus.model import ParamMode, ParamSpec, TypeDescriptor
 
 from .base import BlockBasedCodeGenerator
 from .utils import create_indentation_function
@@ -14,6 +18,127 @@ from .utils import create_indentation_function
 
 indent = create_indentation_function("  ")
 
+#: Regular expression matching the %C%, %I% and %C1%, %C2%, ... tokens in
+#: conversion templates
+_TOKEN_REGEXP = re.compile(r"%(C\d*|I)%")
+
+
+#: Type alias for compiled conversion templates. A compiled template takes a
+#: dict mapping token names (without the percent signs) to their replacements
+#: and returns the substituted template.
+CompiledTemplate = Callable[[Dict[str, str]], str]
+
+
+def _compile_template(template: str) -> Optional[CompiledTemplate]:
+    """Compiles the given conversion template into a function that indents
+    the template and substitutes its tokens.
+
+    The template is split along its tokens only once; the returned function
+    only needs to look up the replacements and join the segments. Tokens that
+    are not in the mapping passed to the function are left intact.
+
+    Returns:
+        the compiled template, or `None` if the template is empty
+    """
+    if not template:
+        return None
+
+    parts = _TOKEN_REGEXP.split(indent(template))
+    if len(parts) == 1:
+        text = parts[0]
+        return lambda mapping: text
+
+    # Even indices of parts contain literal segments, odd indices contain
+    # token names
+    tokens = [(index, f"%{token}%") for index, token in enumerate(parts) if index % 2]
+
+    def func(mapping: Dict[str, str]) -> str:
+        segments = parts.copy()
+        for index, original in tokens:
+            segments[index] = mapping.get(parts[index], original)
+        return "".join(segments)
+
+    return func
+
+
+@dataclass(frozen=True)
+class TypeInfo:
+    """Properties of a type descriptor that the Java code generators need
+    for every parameter of every function, resolved once per type.
+
+    Keys that are missing from the type descriptor are represented with
+    `None`. Conversion templates are compiled and indented for each mode;
+    templates that do not apply in a given mode are represented with `None`.
+    """
+
+    __slots__ = (
+        "descriptor",
+        "ctype",
+        "javatype",
+        "javadecl",
+        "call",
+        "inconv",
+        "outconv",
+    )
+
+    descriptor: TypeDescriptor
+    ctype: Optional[str]
+    javatype: Optional[str]
+    javadecl: Optional[str]
+    call: Optional[str]
+    inconv: Dict[ParamMode, Optional[CompiledTemplate]]
+    outconv: Dict[ParamMode, Optional[CompiledTemplate]]
+
+    @classmethod
+    def from_type_descriptor(cls, descriptor: TypeDescriptor):
+        return cls(
+            descriptor=descriptor,
+            ctype=descriptor.get("CTYPE"),
+            javatype=descriptor.get("JAVATYPE"),
+            javadecl=descriptor.get("JAVADECL"),
+            call=descriptor.get("CALL"),
+            inconv={
+                mode: _compile_template(
+                    descriptor.get_input_conversion_template_for(mode)
+                )
+                for mode in ParamMode
+            },
+            outconv={
+                mode: _compile_template(
+                    descriptor.get_output_conversion_template_for(mode)
+                )
+                for mode in ParamMode
+            },
+        )
+
+
+@dataclass(frozen=True)
+class FunctionInfo:
+    """Java calling semantics of a function, independently of whether the
+    function is rendered in Java or in C.
+    """
+
+    __slots__ = ("name", "method_name", "self_name", "return_type", "arguments")
+
+    name: str
+    """Name of the function in the generated Java code"""
+
+    method_name: str
+    """Name of the Java method; the name of static methods is capitalized"""
+
+    self_name: Optional[str]
+    """Name of the "self" argument, or `None` if the method is static"""
+
+    return_type: str
+    """Name of the abstract return type of the Java method"""
+
+    arguments: Tuple[ParamSpec, ...]
+    """Parameters that become the arguments of the Java method"""
+
+    @property
+    def is_static(self) -> bool:
+        return self.self_name is None
+
 
 class JavaCodeGenerator(BlockBasedCodeGenerator):
     """Class containing the common parts of JavaJavaCodeGenerator and
@@ -21,6 +146,45 @@ class JavaCodeGenerator(BlockBasedCodeGenerator):
 
     package = "net.sf.igraph"
 
+    _function_info: Dict[str, FunctionInfo]
+    _type_info: Dict[str, TypeInfo]
+
+    def __init__(self):
+        super().__init__()
+        self._function_info = {}
+        self._type_info = {}
+
+    def get_type_info(self, name: str) -> TypeInfo:
+        """Returns the preresolved properties of the type with the given name.
+
+        This function is memoized.
+
+        Raises:
+            NoSuchTypeError: if there is no such type
+        """
+        info = self._type_info.get(name)
+        if info is None:
+            self._type_info[name] = info = TypeInfo.from_type_descriptor(
+                self.get_type_descriptor(name)
+            )
+        return info
+
+    def get_function_info(self, name: str) -> FunctionInfo:
+        """Returns the Java calling semantics of the function with the given
+        name.
+
+        This function is memoized. Do not override this function; override
+        `_get_function_info()` instead.
+
+        Raises:
+            StimulusError: if the calling convention of the function is not
+                supported by the Java interface
+        """
+        info = self._function_info.get(name)
+        if info is None:
+            self._function_info[name] = info = self._get_function_info(name)
+        return info
+
     def get_function_metadata(
         self, name: str, type_param: str = "JAVATYPE"
     ) -> Dict[str, Any]:
@@ -35,107 +199,165 @@ class JavaCodeGenerator(BlockBasedCodeGenerator):
         - self_name: name of the "self" argument
         - is_static: whether the function is static
         - is_constructor: whether the function is a constructor
+
+        The types are taken from the `type_param` key of the type descriptors.
+        Only this last rendering step is repeated for each call; the rest is
+        shared via `get_function_info()`.
         """
-        spec = self.get_function_descriptor(name)
-        is_constructor = False
+        info = self.get_function_info(name)
+        return_type, argument_types = self._render_types(info, type_param)
 
-        # We will collect data related to the current function in a dict
         data = {}
-        data["name"] = spec.get_name_in_generated_code("Java")
-        data["java_modifiers"] = ["public"]
+        data["name"] = info.method_name
+        data["java_modifiers"] = "public static" if info.is_static else "public"
+        data["return_type"] = return_type
+        data["argument_types"] = argument_types
+        if not info.is_static:
+            data["self_name"] = info.self_name
+        data["is_static"] = info.is_static
+        data["is_constructor"] = False
 
-        # Check parameter types to determine Java calling semantics
-        types = {"IN": [], "OUT": [], "INOUT": []}
+        return data
+
+    def _get_function_info(self, name: str) -> FunctionInfo:
+        """Determines the Java calling semantics of the function with the
+        given name; see `get_function_info()`.
+        """
+        spec = self.get_function_descriptor(name)
+        java_name = spec.get_name_in_generated_code("Java")
+
+        # Classify the parameters by mode, and find the 'self' argument and
+        # the arguments of the Java method in the same pass. Only OUT and
+        # INOUT parameters become arguments of the Java method; the first
+        # GRAPH among them is the 'self' argument instead.
+        out_params = []
+        inout_params = []
+        argument_params = []
+        self_name = None
         for param in spec.iter_parameters():
-            types[param.mode_str].append(param)
+            mode = param.mode
+            if mode is ParamMode.IN:
+                continue
+            elif mode is ParamMode.OUT:
+                out_params.append(param)
+            else:
+                inout_params.append(param)
 
-        if len(types["OUT"]) + len(types["INOUT"]) == 1:
+            if self_name is None and param.type == "GRAPH":
+                # this will be the 'self' argument
+                self_name = param.name
+            else:
+                argument_params.append(param)
+
+        # Check parameter types to determine Java calling semantics
+        num_outputs = len(out_params) + len(inout_params)
+        if num_outputs == 1:
             # If a single one is OUT or INOUT and all others are
             # INs, then this is our lucky day - the method fits the Java
             # semantics
-            if len(types["OUT"]) > 0:
-                return_type_name = types["OUT"][0].type
-            else:
-                return_type_name = types["INOUT"][0].type
-        elif len(types["OUT"]) + len(types["INOUT"]) == 0 and spec.return_type:
+            return_type_name = (out_params or inout_params)[0].type
+        elif num_outputs == 0 and spec.return_type:
             # There are only input parameters and the return type is specified,
             # this also fits the Java semantics
             return_type_name = spec.return_type
         else:
             raise StimulusError(
-                "{}: calling convention unsupported yet".format(data["name"])
+                "{}: calling convention unsupported yet".format(java_name)
             )
 
-        # Loop through the input parameters
-        method_arguments = []
-        found_self = False
-        for param in spec.iter_parameters():
-            if param.mode is ParamMode.IN:
-                continue
+        if self_name is None:
+            method_name = java_name[0].upper() + java_name[1:]
+        else:
+            method_name = java_name
+
+        return FunctionInfo(
+            name=java_name,
+            method_name=method_name,
+            self_name=self_name,
+            return_type=return_type_name,
+            arguments=tuple(argument_params),
+        )
+
+    def _render_types(
+        self, info: FunctionInfo, type_param: str
+    ) -> Tuple[str, List[str]]:
+        """Renders the return type and the argument declarations of the Java
+        method described by the given function info, using the `type_param`
+        key of the type descriptors (typically ``JAVATYPE`` or ``CTYPE``).
+
+        Returns:
+            the return type and the list of argument declarations
 
+        Raises:
+            StimulusError: if one of the types is unknown or does not have the
+                given key
+        """
+        if type_param == "JAVATYPE":
+            get_type = attrgetter("javatype")
+        elif type_param == "CTYPE":
+            get_type = attrgetter("ctype")
+        else:
+
+            def get_type(type_info: TypeInfo) -> Optional[str]:
+                return type_info.descriptor.get(type_param)
+
+        def lookup(type_name: str) -> Optional[str]:
+            try:
+                return get_type(self.get_type_info(type_name))
+            except NoSuchTypeError:
+                return None
+
+        method_arguments = []
+        for param in info.arguments:
             type_name = param.type
-            if not found_self and type_name == "GRAPH":
-                # this will be the 'self' argument
-                found_self = True
-                data["self_name"] = param.name
-                continue
-            tdesc = self.get_or_create_type_descriptor(type_name)
-            if type_param not in tdesc:
+            type_str = lookup(type_name)
+            if type_str is None:
                 raise StimulusError(
                     "{}: unknown input type {} (needs {}), skipping".format(
-                        data["name"], type_name, type_param
+                        info.name, type_name, type_param
                     )
                 )
-            method_arguments.append(" ".join([tdesc[type_param], param.name]))
-        data["argument_types"] = method_arguments
-
-        if not found_self:
-            # Loop through INOUT arguments if we found no "self" yet
-            for param in spec.iter_parameters():
-                if param.mode is ParamMode.OUT and param.type == "GRAPH":
-                    found_self = True
-                    data["self_name"] = param.name
-                    break
-
-        tdesc = self.get_or_create_type_descriptor(return_type_name)
-        if type_param not in tdesc:
+            method_arguments.append(f"{type_str} {param.name}")
+
+        return_type = lookup(info.return_type)
+        if return_type is None:
             raise StimulusError(
                 "{}: unknown return type {}, skipping".format(
-                    data["name"], return_type_name
+                    info.name, info.return_type
                 )
             )
-        data["return_type"] = tdesc[type_param]
-
-        if not found_self:
-            data["java_modifiers"].append("static")
-            data["name"] = data["name"][0].upper() + data["name"][1:]
-
-        data["java_modifiers"] = " ".join(data["java_modifiers"])
-        data["is_static"] = not found_self
-        data["is_constructor"] = is_constructor
 
-        return data
+        return return_type, method_arguments
 
 
 class JavaJavaCodeGenerator(JavaCodeGenerator):
     def generate_function(self, name: str, out: IO[str]) -> None:
         try:
-            func_metadata = self.get_function_metadata(name)
-            func_metadata["arguments"] = ", ".join(func_metadata["argument_types"])
-            out.write(
-                "    %(java_modifiers)s native %(return_type)s %(name)s(%(arguments)s);\n"
-                % func_metadata
-            )
+            data = self.get_function_metadata(name)
         except StimulusError as e:
-            out.write("    // %s\n" % str(e))
+            out.write(f"    // {e}\n")
+            return
+
+        modifiers = data["java_modifiers"]
+        return_type = data["return_type"]
+        arguments = ", ".join(data["argument_types"])
+        out.write(
+            f"    {modifiers} native {return_type} {data['name']}({arguments});\n"
+        )
 
 
 class JavaCCodeGenerator(JavaCodeGenerator):
+    _jni_class_prefix: str
+
+    def __init__(self):
+        super().__init__()
+        self._jni_class_prefix = self.package.replace(".", "_")
+
     def generate_function(self, function: str, out: IO[str]) -> None:
         try:
             self.metadata = self.get_function_metadata(function, "CTYPE")
         except StimulusError as e:
-            out.write("\n/* %s */\n" % str(e))
+            out.write(f"\n/* {e} */\n")
             return
 
         # Check types
@@ -151,43 +373,38 @@ class JavaCCodeGenerator(JavaCodeGenerator):
         ## See the documentation of each chunk below.
         params = desc.parameters
         try:
-            res = {}
-            res["func"] = function
-            res["header"] = self.chunk_header(function, params)
-            res["decl"] = self.chunk_declaration(function, params)
-            res["before"] = self.chunk_before(function, params)
-            res["inconv"] = self.chunk_inconv(function)
-            res["call"] = self.chunk_call(function, params)
-            res["outconv"] = self.chunk_outconv(function, params)
-            res["after"] = self.chunk_after(function, params)
+            header = self.chunk_header(function, params)
+            decl = self.chunk_declaration(function, params)
+            before = self.chunk_before(function, params)
+            inconv = self.chunk_inconv(function)
+            call = self.chunk_call(function, params)
+            outconv = self.chunk_outconv(function, params)
+            after = self.chunk_after(function, params)
         except StimulusError as e:
-            out.write("/* %s */\n" % str(e))
+            out.write(f"/* {e} */\n")
             return
 
         # Replace into the template
-        text = (
-            """
+        text = f"""
 /*-------------------------------------------/
-/ %(func)-42s /
+/ {function:<42} /
 /-------------------------------------------*/
-%(header)s {
+{header} {{
                                         /* Declarations */
-%(decl)s
+{decl}
 
-%(before)s
+{before}
                                         /* Convert input */
-%(inconv)s
+{inconv}
                                         /* Call igraph */
-%(call)s
+{call}
                                         /* Convert output */
-%(outconv)s
+{outconv}
 
-%(after)s
+{after}
 
   return result;
-}\n"""
-            % res
-        )
+}}\n"""
 
         out.write(text)
 
@@ -202,23 +419,20 @@ class JavaCCodeGenerator(JavaCodeGenerator):
         need 'jobject jobj'. Besides that, the Java environment pointer
         is also passed.
         """
-        data = self.get_function_metadata(function, "JAVATYPE")
+        info = self.get_function_info(function)
+        return_type, argument_types = self._render_types(info, "JAVATYPE")
 
-        data["funcname"] = "Java_%s_Graph_%s" % (
-            self.package.replace(".", "_"),
-            data["name"],
-        )
+        funcname = f"Java_{self._jni_class_prefix}_Graph_{info.method_name}"
 
-        if data["is_static"]:
-            data["argument_types"].insert(0, "jclass cls")
+        if info.is_static:
+            argument_types.insert(0, "jclass cls")
         else:
-            data["argument_types"].insert(0, "jobject " + data["self_name"])
-        data["argument_types"].insert(0, "JNIEnv *env")
+            argument_types.insert(0, "jobject " + info.self_name)
+        argument_types.insert(0, "JNIEnv *env")
 
-        data["types"] = ", ".join(data["argument_types"])
+        types = ", ".join(argument_types)
 
-        res = "JNIEXPORT %(return_type)s JNICALL %(funcname)s(%(types)s)" % data
-        return res
+        return f"JNIEXPORT {return_type} JNICALL {funcname}({types})"
 
     def chunk_declaration(self, function: str, params: Dict[str, ParamSpec]) -> str:
         """The declaration part of the function body
@@ -236,40 +450,52 @@ class JavaCCodeGenerator(JavaCodeGenerator):
         desc = self.get_function_descriptor(function)
 
         def do_cpar(spec: ParamSpec) -> str:
-            type_desc = self.get_type_descriptor(spec.type)
+            type_desc = self.get_type_info(spec.type).descriptor
             return type_desc.declare_c_variable(f"c_{spec.name}", mode=spec.mode)
 
         def do_jpar(spec: ParamSpec) -> str:
-            type_desc = self.get_type_descriptor(spec.type)
+            type_desc = self.get_type_info(spec.type).descriptor
             return type_desc.declare_c_variable(
                 f"j_{spec.name}", mode=spec.mode, name_token="%J%"
             )
 
-        inout = [do_cpar(param) for param in desc.iter_parameters()]
-        out = [
-            do_jpar(param)
-            for param in desc.iter_parameters()
-            if param.mode is ParamMode.OUT
-        ]
-
-        return_type_desc = self.get_type_descriptor(desc.return_type)
+        decls = []
+        out_decls = []
+        first_output = None
+        for param in desc.iter_parameters():
+            decl = do_cpar(param)
+            if decl:
+                decls.append(decl)
+            mode = param.mode
+            if mode is ParamMode.IN:
+                continue
+            if mode is ParamMode.OUT:
+                decl = do_jpar(param)
+                if decl:
+                    out_decls.append(decl)
+            if first_output is None:
+                first_output = param
+        decls.extend(out_decls)
+
+        return_type_desc = self.get_type_info(desc.return_type).descriptor
         retdecl = return_type_desc.declare_c_variable("c__result")
+        if retdecl:
+            decls.append(retdecl)
 
-        rnames = [n for n, p in params.items() if p.is_output]
         jretdecl = ""
-        if len(rnames) > 0:
-            n = rnames[0]
-            rtname = params[n].type
+        if first_output is not None:
+            rtname = first_output.type
         else:
             rtname = desc.return_type
 
-        rt = self.get_type_descriptor(rtname)
-        if "JAVADECL" in rt:
-            jretdecl = rt["JAVADECL"]
-        elif "JAVATYPE" in rt:
-            jretdecl = rt["JAVATYPE"] + " result;"
+        rt = self.get_type_info(rtname)
+        if rt.javadecl is not None:
+            jretdecl = rt.javadecl
+        elif rt.javatype is not None:
+            jretdecl = rt.javatype + " result;"
+        if jretdecl:
+            decls.append(jretdecl)
 
-        decls = inout + out + [retdecl, jretdecl]
         if not self.metadata["is_static"] and rtname == "GRAPH":
             self.metadata["need_class_decl"] = True
             decls.append(
@@ -278,7 +504,7 @@ class JavaCCodeGenerator(JavaCodeGenerator):
             )
         else:
             self.metadata["need_class_decl"] = False
-        return indent("\n".join(i for i in decls if i != ""))
+        return indent("\n".join(decls))
 
     def chunk_before(self, function: str, params: Dict[str, ParamSpec]) -> str:
         """We simply call Java_igraph_before"""
@@ -295,18 +521,20 @@ class JavaCCodeGenerator(JavaCodeGenerator):
         desc = self.get_function_descriptor(function)
 
         def do_par(param: ParamSpec):
-            cname = "c_" + param.name
-            t = self.get_type_descriptor(param.type)
-            inconv = t.get_input_conversion_template_for(param.mode)
-            if inconv:
-                inconv = indent(inconv)
-            for i, dep in enumerate(param.dependencies):
-                inconv = inconv.replace("%C" + str(i + 1) + "%", "c_" + dep)
+            inconv = self.get_type_info(param.type).inconv[param.mode]
+            if inconv is None:
+                return ""
 
-            return inconv.replace("%C%", cname).replace("%I%", param.name)
+            mapping = {"C": "c_" + param.name, "I": param.name}
+            for i, dep in enumerate(param.dependencies):
+                mapping["C" + str(i + 1)] = "c_" + dep
+            return inconv(mapping)
 
-        inconv = [do_par(param) for param in desc.iter_parameters()]
-        inconv = [i for i in inconv if i != ""]
+        inconv = []
+        for param in desc.iter_parameters():
+            line = do_par(param)
+            if line:
+                inconv.append(line)
 
         return "\n".join(inconv)
 
@@ -316,17 +544,13 @@ class JavaCCodeGenerator(JavaCodeGenerator):
         usual %C% and %I% substitutions, otherwise the standard 'c_'
         prefixed C argument name is used.
         """
-        types = [self.get_type_descriptor(params[n].type) for n in params]
-        call = list(
-            map(lambda t, n: t.get("CALL", "c_" + n), types, list(params.keys()))
-        )
-        call = list(
-            map(
-                lambda c, n: c.replace("%C%", "c_" + n).replace("%I%", n),
-                call,
-                list(params.keys()),
-            )
-        )
+        call = []
+        for n, p in params.items():
+            template = self.get_type_info(p.type).call
+            if template is None:
+                call.append("c_" + n)
+            else:
+                call.append(template.replace("%C%", "c_" + n).replace("%I%", n))
         lines = [
             "  if ((*env)->ExceptionCheck(env)) {",
             "    c__result = IGRAPH_EINVAL;",
@@ -361,28 +585,29 @@ class JavaCCodeGenerator(JavaCodeGenerator):
 
         spec = self.get_function_descriptor(function)
 
-        def do_par(pname):
-            cname = "c_" + pname
-            jname = "j_" + pname
-            t = self.get_type_descriptor(params[pname].type)
-            outconv = t.get_output_conversion_template_for(params[pname].mode)
-            if outconv:
-                outconv = indent(outconv)
-            return outconv.replace("%C%", cname).replace("%I%", jname)
+        def do_par(pname: str, param: ParamSpec) -> str:
+            outconv = self.get_type_info(param.type).outconv[param.mode]
+            if outconv is None:
+                return ""
+
+            mapping = {"C": "c_" + pname, "I": "j_" + pname}
+            return outconv(mapping)
 
-        outconv = [do_par(n) for n in params]
-        outconv = [o for o in outconv if o != ""]
+        outconv = []
+        retpars = []
+        for n, p in params.items():
+            line = do_par(n, p)
+            if line:
+                outconv.append(line)
+            if p.mode is not ParamMode.IN:
+                retpars.append((n, p))
 
-        retpars = [(n, p) for n, p in params.items() if p.is_output]
         if len(retpars) == 0:
             # return the return value of the function
-            rt = self.get_type_descriptor(spec.return_type)
-            retconv = rt.get_output_conversion_template_for(ParamMode.OUT)
-            if retconv:
-                retconv = indent(retconv)
-            retconv = retconv.replace("%C%", "c__result").replace("%I%", "result")
-            if len(retconv) > 0:
-                outconv.append(retconv)
+            rt = self.get_type_info(spec.return_type)
+            retconv = rt.outconv[ParamMode.OUT]
+            if retconv is not None:
+                outconv.append(retconv({"C": "c__result", "I": "result"}))
             ret = "\n".join(outconv)
         elif len(retpars) == 1:
             # return the single output value
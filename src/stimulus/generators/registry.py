@@ -2,19 +2,38 @@
 generators.
 """
 
-from typing import Callable, Dict
+from importlib import import_module
+from typing import Callable, Dict, Tuple
 
 from .base import CodeGenerator
 
 __all__ = ("get_code_generator_factory_for_language", "is_valid_language")
 
 
-#: Dictionary mapping language codes to code generators
-_registry: Dict[str, Callable[[], CodeGenerator]] = {}
-
-#: Flag storing whether the registry has already been initialized with the
-#: code generators
-_registry_initialized: bool = False
+#: Dictionary mapping language codes to the module and the name of the
+#: corresponding code generator. Modules are relative to this package and are
+#: imported only when the code generator is first requested.
+_registry: Dict[str, Tuple[str, str]] = {
+    "ci:validate": (".debug", "FunctionSpecificationValidator"),
+    "debug:list-types": (".debug", "ListTypesCodeGenerator"),
+    "java:c": (".java", "JavaCCodeGenerator"),
+    "java:java": (".java", "JavaJavaCodeGenerator"),
+    "python:ctypes": (".python", "PythonCTypesCodeGenerator"),
+    "python:ctypes-typed-wrapper": (".python", "PythonCTypesTypedWrapperCodeGenerator"),
+    "r:c": (".r", "RCCodeGenerator"),
+    "r:init": (".r", "RInitCodeGenerator"),
+    "r:r": (".r", "RRCodeGenerator"),
+    "shell": (".shell", "ShellCodeGenerator"),
+    # legacy names
+    "RC": (".r", "RCCodeGenerator"),
+    "RInit": (".r", "RInitCodeGenerator"),
+    "RR": (".r", "RRCodeGenerator"),
+    "Shell": (".shell", "ShellCodeGenerator"),
+}
+
+#: Dictionary mapping language codes to code generators that have already been
+#: imported
+_factories: Dict[str, Callable[[], CodeGenerator]] = {}
 
 
 def get_code_generator_factory_for_language(
@@ -22,55 +41,20 @@ def get_code_generator_factory_for_language(
 ) -> Callable[[], CodeGenerator]:
     """Returns the class or factory function that is responsible for generating
     code in the given language.
-    """
-    global _registry_initialized, _registry
 
-    if not _registry_initialized:
-        _register_code_generators()
-        _registry_initialized = True
-
-    return _registry[lang]
+    Raises:
+        KeyError: if there is no code generator for the given language
+    """
+    factory = _factories.get(lang)
+    if factory is None:
+        module_name, name = _registry[lang]
+        module = import_module(module_name, __package__)
+        _factories[lang] = factory = getattr(module, name)
+    return factory
 
 
 def is_valid_language(lang: str) -> bool:
     """Returns whether there is a class or factory function that is responsible
     for generating code in the given language.
     """
-    try:
-        get_code_generator_factory_for_language(lang)
-        return True
-    except KeyError:
-        return False
-
-
-def _register_code_generators() -> None:
-    """Register all code generators in the project into the registry."""
-    from .debug import FunctionSpecificationValidator, ListTypesCodeGenerator
-    from .java import JavaCCodeGenerator, JavaJavaCodeGenerator
-    from .python import PythonCTypesCodeGenerator, PythonCTypesTypedWrapperCodeGenerator
-    from .r import (
-        RCCodeGenerator,
-        RInitCodeGenerator,
-        RRCodeGenerator,
-    )
-    from .shell import ShellCodeGenerator
-
-    updates = {
-        "ci:validate": FunctionSpecificationValidator,
-        "debug:list-types": ListTypesCodeGenerator,
-        "java:c": JavaCCodeGenerator,
-        "java:java": JavaJavaCodeGenerator,
-        "python:ctypes": PythonCTypesCodeGenerator,
-        "python:ctypes-typed-wrapper": PythonCTypesTypedWrapperCodeGenerator,
-        "r:c": RCCodeGenerator,
-        "r:init": RInitCodeGenerator,
-        "r:r": RRCodeGenerator,
-        "shell": ShellCodeGenerator,
-        # legacy names
-        "RC": RCCodeGenerator,
-        "RInit": RInitCodeGenerator,
-        "RR": RRCodeGenerator,
-        "Shell": ShellCodeGenerator,
-    }
-
-    _registry.update(updates)
+    return lang in _registry
@@ -58,6 +58,13 @@ class FunctionDescriptor(Mapping[str, Any], DescriptorMixin):
 
     @property
     def parameters(self) -> OrderedDict[str, ParamSpec]:
+        """Returns the specifications of the parameters of this function,
+        keyed by parameter name.
+
+        The specifications are parsed on first access and cached until the
+        ``PARAMS``, ``DEPS``, ``PARAM_NAMES`` or ``PARAM_ORDER`` key of the
+        descriptor is updated.
+        """
         if self._parameters is None:
             self._parameters = self._parse_parameter_specifications()
             self._update_parameter_order()
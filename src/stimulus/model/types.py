@@ -163,26 +163,23 @@ class TypeDescriptor(Mapping[str, Any], DescriptorMixin):
         `INOUT` mode, it is assumed to be identical to the code snippet for
         the `IN` mode.
         """
-        if "INCONV" in self:
-            inconv = self["INCONV"]
-            if isinstance(inconv, str):
-                return inconv if mode.is_input else default
-            elif isinstance(inconv, dict):
-                try:
-                    return inconv[mode.value.upper()] or default
-                except KeyError:
-                    if mode is ParamMode.INOUT:
-                        return self.get_input_conversion_template_for(
-                            ParamMode.IN, default=default
-                        )
-                    else:
-                        return default
-            else:
-                raise TypeError(
-                    f"INCONV should be a string or a dict for type {self.name}"
-                )
-        else:
+        inconv = self._obj.get("INCONV", _MISSING)
+        if inconv is _MISSING:
             return default
+        elif isinstance(inconv, str):
+            return inconv if mode.is_input else default
+        elif isinstance(inconv, dict):
+            try:
+                return inconv[mode.value.upper()] or default
+            except KeyError:
+                if mode is ParamMode.INOUT:
+                    return self.get_input_conversion_template_for(
+                        ParamMode.IN, default=default
+                    )
+                else:
+                    return default
+        else:
+            raise TypeError(f"INCONV should be a string or a dict for type {self.name}")
 
     def get_output_conversion_template_for(
         self, mode: ParamMode, *, default: str = ""
@@ -195,26 +192,25 @@ class TypeDescriptor(Mapping[str, Any], DescriptorMixin):
         `INOUT` mode, it is assumed to be identical to the code snippet for
         the `OUT` mode.
         """
-        if "OUTCONV" in self:
-            outconv = self["OUTCONV"]
-            if isinstance(outconv, str):
-                return outconv if mode.is_output else default
-            elif isinstance(outconv, dict):
-                try:
-                    return outconv[mode.value.upper()] or default
-                except KeyError:
-                    if mode is ParamMode.INOUT:
-                        return self.get_output_conversion_template_for(
-                            ParamMode.OUT, default=default
-                        )
-                    else:
-                        return default
-            else:
-                raise TypeError(
-                    f"OUTCONV should be a string or a dict for type {self.name}"
-                )
-        else:
+        outconv = self._obj.get("OUTCONV", _MISSING)
+        if outconv is _MISSING:
             return default
+        elif isinstance(outconv, str):
+            return outconv if mode.is_output else default
+        elif isinstance(outconv, dict):
+            try:
+                return outconv[mode.value.upper()] or default
+            except KeyError:
+                if mode is ParamMode.INOUT:
+                    return self.get_output_conversion_template_for(
+                        ParamMode.OUT, default=default
+                    )
+                else:
+                    return default
+        else:
+            raise TypeError(
+                f"OUTCONV should be a string or a dict for type {self.name}"
+            )
 
     def has_flag(self, flag: str) -> bool:
         """Checks whether the type descriptor has the given flag, in a
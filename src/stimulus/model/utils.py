@@ -1,12 +1,17 @@
+import re
+
+from functools import lru_cache
+
 __all__ = ("camelcase",)
 
 
+#: Regular expression matching an underscore and the word that follows it
+_UNDERSCORE_WORD_REGEXP = re.compile(r"_([^_]*)")
+
+
+@lru_cache(maxsize=1024)
 def camelcase(s: str) -> str:
     """Returns a camelCase version of the given string (as used in Java
     libraries.
     """
-    parts = s.split("_")
-    result = [parts.pop(0)]
-    for part in parts:
-        result.append(part.capitalize())
-    return "".join(result)
+    return _UNDERSCORE_WORD_REGEXP.sub(lambda match: match.group(1).capitalize(), s)